@@ -4,29 +4,195 @@ Pat Python - Agentic API for Blackjack Agent
 A funny and lighthearted blackjack agent with direct HTTP API endpoints
 """
 
+import asyncio
+import functools
+import logging
+import time
+import httpx
 import uvicorn
-import json
 import os
+import random
+import sys
+from contextlib import asynccontextmanager
 from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse
+
+import anyio.to_thread
+import msgspec
+from cachetools import TTLCache
 
 # FastAPI imports
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi.responses import Response
 
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
+from azure.identity.aio import DefaultAzureCredential
+from openai import AsyncAzureOpenAI, APIConnectionError, APIStatusError
 
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+log = logging.getLogger("pat-python")
+# Stack traces for handler errors are only formatted when asked for
+DEBUG_TRACE = os.getenv("DEBUG_TRACE", "").lower() in ("1", "true", "yes")
+
 # Pat's personality and betting constants
 PAT_PERSONALITY = "funny, lighthearted, dramatic, and slightly sarcastic blackjack player"
-VALID_ACTIONS = ["hit", "stand"]
 MIN_BET = 5
 MAX_BET = 100
 
-# Pydantic models for API input/output (matching shared schemas)
-class PublicPlayer(BaseModel):
+# System prompts - invariant instructions go first so the service can reuse
+# its prompt prefix cache; each user message only carries the game state
+TALK_SYSTEM = """You are Pat Python, a funny and lighthearted blackjack player known for witty comments.
+
+The user message is the current game situation as: hand_value|dealer_upcard|bankroll|hand_number
+
+Generate a SHORT, funny comment (max 160 characters) that Pat would say right now. Be:
+- Humorous and entertaining
+- Slightly dramatic or sarcastic
+- Reactive to the current situation
+- Authentic to a blackjack player's mindset
+
+Return ONLY the comment text, no quotes or JSON."""
+
+DECIDE_SYSTEM = """You are Pat Python explaining a blackjack decision. You're funny but want to win money.
+
+The user message is the game state as: action|my_cards|hand_value|dealer_upcard|bankroll
+The action (hit or stand) has already been chosen by basic strategy - explain it, don't change it.
+
+BLACKJACK RULES:
+- Goal: Get close to 21 without going over
+- Dealer hits on 16, stands on 17
+- Aces = 1 or 11, face cards = 10
+
+Give a rationale for the action with Pat's entertaining personality, and how confident Pat feels about it.
+
+Respond with ONLY this JSON format:
+{"confidence": 0.8, "rationale": "Your funny explanation (max 240 chars)"}"""
+
+BET_SYSTEM = f"""You are Pat Python deciding how much to bet on a blackjack hand.
+
+The user message is: bankroll|hand_number
+BET LIMITS: ${MIN_BET} minimum, ${MAX_BET} maximum
+
+Pat's personality:
+- Confident and slightly cocky
+- Generally bets 15-25% of bankroll (his "sweet spot")
+- More aggressive when bankroll is healthy (75+)
+- More conservative when low (25 or less)
+- Always has witty reasoning
+
+Generate a betting decision that fits Pat's personality and bankroll situation.
+
+Respond with ONLY this JSON format:
+{{"bet_amount": 20, "rationale": "Your funny explanation for the bet size (max 160 chars)"}}"""
+
+START_HAND_SYSTEM = f"""You are Pat Python, a funny and lighthearted blackjack player, starting a new hand.
+
+The user message is: bankroll|hand_number
+BET LIMITS: ${MIN_BET} minimum, ${MAX_BET} maximum
+
+Pat's personality:
+- Confident and slightly cocky
+- Generally bets 15-25% of bankroll (his "sweet spot")
+- More aggressive when bankroll is healthy (75+)
+- More conservative when low (25 or less)
+- Always has witty reasoning
+
+Decide the bet for this hand AND a SHORT, funny comment (max 160 characters) Pat says as the cards come out.
+
+Respond with ONLY this JSON format:
+{{"bet_amount": 20, "bet_rationale": "Your funny explanation for the bet size (max 160 chars)", "talk": "Your table comment"}}"""
+
+# Structured outputs - the service constrains generation to these schemas
+DECIDE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "decision",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "confidence": {"type": "number"},
+                "rationale": {"type": "string"}
+            },
+            "required": ["confidence", "rationale"],
+            "additionalProperties": False
+        }
+    }
+}
+
+BET_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "bet",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "bet_amount": {"type": "integer"},
+                "rationale": {"type": "string"}
+            },
+            "required": ["bet_amount", "rationale"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Decision rationale when the LLM can't provide one
+STRATEGY_CONFIDENCE = 0.8
+STRATEGY_RATIONALES = {
+    "hit": "Hit me! Fortune favors the bold Python!",
+    "stand": "I'm standing pat - and yes, that's my name!"
+}
+TALK_MAX_CHARS = 160
+RATIONALE_MAX_CHARS = 240
+
+START_HAND_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "start_hand",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "bet_amount": {"type": "integer"},
+                "bet_rationale": {"type": "string"},
+                "talk": {"type": "string"}
+            },
+            "required": ["bet_amount", "bet_rationale", "talk"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Per-call user messages, bound once at import
+TALK_USER_TMPL = "{my_hand_value}|{dealer_upcard}|{bankroll}|{hand_number}".format_map
+DECIDE_USER_TMPL = "{action}|{my_cards}|{my_hand_value}|{dealer_upcard}|{bankroll}".format_map
+BET_USER_TMPL = "{}|{}".format
+
+# Most calls one /batch request may carry (Azure concurrency is capped by the client)
+BATCH_MAX_CALLS = 16
+
+# anyio threadpool size per worker
+THREADPOOL_SIZE = 100
+
+# Azure OpenAI auth
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+AZURE_MAX_CONNECTIONS = int(os.getenv("AZURE_MAX_CONNECTIONS", "32"))
+AZURE_MAX_CONCURRENCY = int(os.getenv("AZURE_MAX_CONCURRENCY", "8"))
+
+# Retries for transient Azure failures (done by the client so backoff happens outside its semaphore)
+AZURE_RETRY_ATTEMPTS = 3
+AZURE_RETRY_BASE_SECONDS = 0.2
+AZURE_RETRY_AFTER_MAX_SECONDS = 5.0
+
+# LLM response caching
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL_SECONDS = 3600
+
+# msgspec structs for API input/output (matching shared schemas)
+class PublicPlayer(msgspec.Struct, frozen=True):
     id: str
     seat: int
     visibleCards: List[int]
@@ -34,55 +200,182 @@ class PublicPlayer(BaseModel):
     bet: Optional[int] = None
     balance: Optional[int] = None
 
-class ChatMsg(BaseModel):
-    from_: str = Field(alias="from")
+class ChatMsg(msgspec.Struct, frozen=True):
+    from_: str = msgspec.field(name="from")
     text: str
 
-class PublicSnapshot(BaseModel):
+class PublicSnapshot(msgspec.Struct, frozen=True):
     handNumber: int
     shoePenetration: float
-    runningCount: Optional[int] = None
     players: List[PublicPlayer]
     dealerUpcard: int
     chat: List[ChatMsg]
+    runningCount: Optional[int] = None
 
-class PrivateInfo(BaseModel):
+class PrivateInfo(msgspec.Struct, frozen=True):
     myHoleCards: List[int]
     mySeat: int
     bankroll: int
 
-class AgentIO(BaseModel):
+class AgentIO(msgspec.Struct, frozen=True):
     role: str  # "table-talk" or "decision"
     public: PublicSnapshot
     me: PrivateInfo
 
-class BetOut(BaseModel):
+class BetIn(msgspec.Struct, frozen=True):
+    bankroll: int = 100
+    handNumber: Optional[int] = None
+    hand_number: int = 1  # Older callers send snake_case
+
+# Decode and validate raw request bytes in a single pass
+AGENT_IO_DECODER = msgspec.json.Decoder(AgentIO)
+BET_IN_DECODER = msgspec.json.Decoder(BetIn)
+
+class BetOut(msgspec.Struct, frozen=True):
     bet_amount: int
     rationale: str
 
-class TalkOut(BaseModel):
+class TalkOut(msgspec.Struct, frozen=True):
     say: str
 
-class DecisionOut(BaseModel):
+class DecisionOut(msgspec.Struct, frozen=True, omit_defaults=True):
     action: str
     confidence: float
     rationale: str
+    say: Optional[str] = None  # Table talk, only when asked for alongside the decision
+
+class StartHandOut(msgspec.Struct, frozen=True):
+    bet_amount: int
+    rationale: str
+    say: str
+
+# Error-path responses are constant - build them once, not per exception
+FALLBACK_SAY = "Oops, my comedy circuits short-circuited!"
+FALLBACK_TALK = TalkOut(say=FALLBACK_SAY)
+FALLBACK_DECISION = DecisionOut(
+    action="stand",
+    confidence=0.4,
+    rationale="My Python circuits are sparking - better play it safe!"
+)
+
+class BatchCall(msgspec.Struct):
+    name: str  # "place_bet", "start_hand", "table_talk", "decide" or "decide_and_talk"
+    arguments: dict = {}
+
+BATCH_CALLS_DECODER = msgspec.json.Decoder(List[BatchCall])
+
+# LLM replies (shapes match the *_RESPONSE_FORMAT schemas)
+class DecisionResp(msgspec.Struct):
+    confidence: float
+    rationale: str
+
+class BetResp(msgspec.Struct):
+    bet_amount: int
+    rationale: str
+
+class StartHandResp(msgspec.Struct):
+    bet_amount: int
+    bet_rationale: str
+    talk: str
+
+DECISION_RESP_DECODER = msgspec.json.Decoder(DecisionResp)
+BET_RESP_DECODER = msgspec.json.Decoder(BetResp)
+START_HAND_RESP_DECODER = msgspec.json.Decoder(StartHandResp)
+
+class CachedTokenProvider:
+    """Bearer token provider that reuses the Azure AD token until shortly before it expires"""
+
+    def __init__(self, credential, scope: str = COGNITIVE_SERVICES_SCOPE):
+        self.credential = credential
+        self.scope = scope
+        self._token = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._token is not None and self._token.expires_on - time.time() > TOKEN_REFRESH_MARGIN_SECONDS
+
+    async def __call__(self) -> str:
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    self._token = await self.credential.get_token(self.scope)
+        return self._token.token
+
+def _retryable(error: Exception) -> bool:
+    """Same failures the SDK retries: connection errors and timeouts, 408, 409, 429 and 5xx"""
+    # Streams are read outside the SDK's error wrapping, so a dropped or stalled one raises raw httpx errors
+    if isinstance(error, (APIConnectionError, httpx.TransportError)):
+        return True
+    return isinstance(error, APIStatusError) and (error.status_code in (408, 409, 429) or error.status_code >= 500)
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the service asked us to wait before retrying, if it said"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        if "retry-after-ms" in response.headers:
+            return float(response.headers["retry-after-ms"]) / 1000
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):  # Missing, or an HTTP date
+        return None
 
 class AzureAIFoundryClient:
     """Azure AI Foundry LLM integration for Pat Python (Aspire-managed)"""
     
     def __init__(self):
         self.enabled = self._load_aspire_config()
+        self._talk_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+        self._decide_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+        self._bet_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
         
         if self.enabled:
-            self.project_client = AIProjectClient(
-                endpoint=self.endpoint,
-                credential=DefaultAzureCredential()
+            # Async OpenAI client against the project's resource (same auth as
+            # AIProjectClient.get_openai_client) so LLM calls don't block the event loop
+            endpoint = urlparse(self.endpoint)
+            self._token_provider = CachedTokenProvider(DefaultAzureCredential())
+            # Shared keep-alive/HTTP2 pool so TLS sessions are reused across requests
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=AZURE_MAX_CONNECTIONS,
+                    max_keepalive_connections=AZURE_MAX_CONNECTIONS,  # Keep every pooled connection warm
+                    keepalive_expiry=60
+                ),
+                timeout=httpx.Timeout(5.0, connect=2.0)
             )
-            # Get an authenticated OpenAI client from the project
-            self.openai_client = self.project_client.get_openai_client(api_version="2025-01-01-preview")
+            self.openai_client = AsyncAzureOpenAI(
+                azure_endpoint=f"{endpoint.scheme}://{endpoint.netloc}",
+                azure_ad_token_provider=self._token_provider,
+                api_version="2025-01-01-preview",
+                http_client=self._http_client,
+                max_retries=0  # _with_retry retries instead, releasing its _sem slot while it backs off
+            )
+            # Caps LLM calls in flight so bursts wait here rather than queueing (and 429ing) at Azure;
+            # cache hits and joined in-flight calls never take a slot
+            self._sem = asyncio.Semaphore(AZURE_MAX_CONCURRENCY)
+
+            # Everything but the user message is fixed per endpoint - build it once
+            self._talk_messages_template = [{"role": "system", "content": TALK_SYSTEM}]
+            self._decide_messages_template = [{"role": "system", "content": DECIDE_SYSTEM}]
+            self._bet_messages_template = [{"role": "system", "content": BET_SYSTEM}]
+            self._start_hand_messages_template = [{"role": "system", "content": START_HAND_SYSTEM}]
+            self._talk_params = {"model": self.deployment_name, "max_tokens": 45, "temperature": 0.8, "stream": True, "timeout": 3.0}
+            self._decide_params = {
+                "model": self.deployment_name, "max_tokens": 90, "temperature": 0.7,
+                "response_format": DECIDE_RESPONSE_FORMAT, "stream": True, "timeout": 5.0
+            }
+            self._bet_params = {
+                "model": self.deployment_name, "max_tokens": 60, "temperature": 0.8,
+                "response_format": BET_RESPONSE_FORMAT, "timeout": 3.0
+            }
+            self._start_hand_params = {
+                "model": self.deployment_name, "max_tokens": 105, "temperature": 0.8,
+                "response_format": START_HAND_RESPONSE_FORMAT, "timeout": 3.0
+            }
         else:
-            print("Azure AI Foundry client disabled - using fallback responses")
+            log.info("Azure AI Foundry client disabled - using fallback responses")
     
     def _load_aspire_config(self) -> bool:
         """Load Azure AI Foundry configuration from Aspire connection string"""
@@ -90,7 +383,7 @@ class AzureAIFoundryClient:
             # Parse connection string from Aspire
             connection_string = os.getenv("ConnectionStrings__patLLM")
             if not connection_string:
-                print("Info: ConnectionStrings__patLLM not provided by Aspire - using fallbacks")
+                log.info("ConnectionStrings__patLLM not provided by Aspire - using fallbacks")
                 return False
             
             # Parse connection string: Endpoint=...;EndpointAIInference=...;DeploymentId=...;Model=...
@@ -110,7 +403,6 @@ class AzureAIFoundryClient:
                 # We need the project name - this might need to be configured separately
                 project_name = os.getenv("FOUNDRY_PROJECT_NAME", "default")
                 self.endpoint = f"{base_endpoint}/api/projects/{project_name}"
-                print(self.endpoint)
             else:
                 self.endpoint = parts.get('Endpoint')
                 
@@ -118,194 +410,304 @@ class AzureAIFoundryClient:
             self.deployment_name = 'PatLLM'
 
             if not self.endpoint:
-                print("Error: No endpoint found in connection string")
+                log.error("No endpoint found in connection string")
                 return False
                 
-            print(f"Parsed Aspire connection string - endpoint: {self.endpoint[:50]}...")
-            print(f"Using deployment: {self.deployment_name}")
+            log.info("Parsed Aspire connection string - endpoint: %s...", self.endpoint[:50])
+            log.info("Using deployment: %s", self.deployment_name)
             return True
             
         except Exception as e:
-            print(f"Error parsing connection string: {e}")
+            log.error("Error parsing connection string: %s", e)
             return False
     
+    async def _cached(self, cache: TTLCache, key: tuple, generate) -> Any:
+        """Serve a response from cache; concurrent misses on the same key share one LLM call"""
+        # A single lookup - the entry could expire between `in` and `[]`
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fill(cache, key, generate))
+            self._inflight[key] = future
+        # Shield so one caller timing out doesn't cancel the call for everyone else
+        return await asyncio.shield(future)
+
+    async def _fill(self, cache: TTLCache, key: tuple, generate) -> Any:
+        try:
+            result = await generate()
+            if result is not None:  # Never cache failures
+                cache[key] = result
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def aclose(self):
+        """Release the pooled Azure connections and the credential"""
+        if self.enabled:
+            await self.openai_client.close()  # Also closes the shared httpx client
+            await self._token_provider.credential.close()
+
+    async def _with_retry(self, attempt) -> Any:
+        """Run attempt() in a _sem slot, retrying transient failures with jittered exponential backoff"""
+        for i in range(AZURE_RETRY_ATTEMPTS):
+            try:
+                async with self._sem:
+                    return await attempt()
+            except (APIConnectionError, APIStatusError, httpx.TransportError) as e:
+                if i == AZURE_RETRY_ATTEMPTS - 1 or not _retryable(e):
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = AZURE_RETRY_BASE_SECONDS * 2 ** i + random.random() * 0.1
+                elif delay > AZURE_RETRY_AFTER_MAX_SECONDS:
+                    raise  # Longer than a player should wait - fall back now
+                log.debug("Retrying Azure call in %.2fs after %s", delay, type(e).__name__)
+            # Back off without holding a slot other requests could use
+            await asyncio.sleep(delay)
+
     async def generate_talk(self, game_context: dict) -> Optional[str]:
         """Generate table talk using Azure AI Foundry"""
         if not self.enabled:
             return None
-            
-        try:
-            prompt = f"""You are Pat Python, a funny and lighthearted blackjack player known for witty comments.
 
-Current game situation:
-- Your hand value: {game_context['my_hand_value']}
-- Dealer's upcard: {game_context['dealer_upcard']} 
-- Your bankroll: ${game_context['bankroll']}
-- Hand #{game_context['hand_number']}
+        key = ("talk", game_context['my_hand_value'], game_context['dealer_upcard'], game_context['bankroll'] // 10)
+        return await self._cached(self._talk_cache, key, lambda: self._request_talk(game_context))
 
-Generate a SHORT, funny comment (max 160 characters) that Pat would say right now. Be:
-- Humorous and entertaining
-- Slightly dramatic or sarcastic 
-- Reactive to the current situation
-- Authentic to a blackjack player's mindset
-
-Return ONLY the comment text, no quotes or JSON."""
-
-            response = self.openai_client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are Pat Python, a witty blackjack player. Keep responses under 160 characters."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=50,
-                temperature=0.8
+    async def _request_talk(self, game_context: dict) -> Optional[str]:
+        async def attempt() -> str:
+            user = TALK_USER_TMPL(game_context)
+            stream = await self.openai_client.chat.completions.create(
+                messages=[*self._talk_messages_template, {"role": "user", "content": user}],
+                **self._talk_params
             )
             
-            comment = response.choices[0].message.content.strip()
-            return comment[:160]  # Ensure max length
-            
+            # Stop reading once we have more than we're allowed to say
+            comment = ""
+            async with stream:
+                async for chunk in stream:
+                    if chunk.choices:  # Azure sends content-filter results without choices
+                        comment += chunk.choices[0].delta.content or ""
+                    if len(comment) > TALK_MAX_CHARS:
+                        break
+            # An empty (e.g. content-filtered) reply is a failure - None keeps it out of the cache
+            return comment.strip()[:TALK_MAX_CHARS] or None  # Ensure max length
+
+        try:
+            return await self._with_retry(attempt)
         except Exception as e:
-            print(f"Azure talk generation failed: {e}")
+            log.warning("Azure talk generation failed: %s", e)
             return None
     
     async def generate_decision(self, game_context: dict) -> Optional[dict]:
-        """Generate blackjack decision using Azure AI Foundry"""
+        """Generate the rationale for a basic-strategy decision using Azure AI Foundry"""
         if not self.enabled:
             return None
-            
-        try:
-            prompt = f"""You are Pat Python making a blackjack decision. You're funny but want to win money.
 
-GAME STATE:
-- Your cards: {game_context['my_cards']} (total value: {game_context['my_hand_value']})
-- Dealer's upcard: {game_context['dealer_upcard']}
-- Your bankroll: ${game_context['bankroll']}
+        # The cards themselves (not just the total) tell soft hands from hard ones
+        key = ("decide", tuple(sorted(game_context['my_cards'])), game_context['dealer_upcard'])
+        return await self._cached(self._decide_cache, key, lambda: self._request_decision(game_context))
 
-AVAILABLE ACTIONS:
-- hit: Take another card
-- stand: Keep current hand
-
-BLACKJACK RULES:
-- Goal: Get close to 21 without going over
-- Dealer hits on 16, stands on 17
-- Aces = 1 or 11, face cards = 10
-
-Make a smart decision considering basic blackjack strategy AND Pat's entertaining personality.
-
-Respond with ONLY this JSON format:
-{{"action": "hit", "confidence": 0.8, "rationale": "Your funny explanation (max 240 chars)"}}"""
-
-            response = self.openai_client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are Pat Python. Make blackjack decisions with good strategy but entertaining personality. Respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=120,
-                temperature=0.7
+    async def _request_decision(self, game_context: dict) -> Optional[dict]:
+        async def attempt() -> dict:
+            user = DECIDE_USER_TMPL(game_context)
+            stream = await self.openai_client.chat.completions.create(
+                messages=[*self._decide_messages_template, {"role": "user", "content": user}],
+                **self._decide_params
             )
             
-            result_text = response.choices[0].message.content.strip()
-            
-            # Parse and validate JSON response
-            result = json.loads(result_text)
-            
-            # Validate required fields and action
-            if not all(key in result for key in ["action", "confidence", "rationale"]):
-                raise ValueError("Missing required fields in response")
-                
-            if result["action"] not in VALID_ACTIONS:
-                raise ValueError(f"Invalid action: {result['action']}")
-                
-            # Ensure rationale length
-            result["rationale"] = result["rationale"][:240]
+            # The schema puts the rationale last - once it's longer than we keep,
+            # close the string ourselves and stop reading the rest of the reply
+            result = None
+            result_text = ""
+            async with stream:
+                async for chunk in stream:
+                    if chunk.choices:  # Azure sends content-filter results without choices
+                        result_text += chunk.choices[0].delta.content or ""
+                    rationale_at = result_text.find('"rationale"')
+                    if rationale_at != -1 and len(result_text) - rationale_at > RATIONALE_MAX_CHARS + 16:
+                        try:
+                            partial = DECISION_RESP_DECODER.decode(result_text + '"}')
+                        except msgspec.DecodeError:
+                            continue  # Cut mid-escape or the reply already ended - keep reading
+                        if len(partial.rationale) >= RATIONALE_MAX_CHARS:  # Escapes make it shorter than the raw text
+                            result = partial
+                            break
             
-            return result
+            # The schema guarantees the shape; parsing still fails safe on a truncated reply
+            if result is None:
+                result = DECISION_RESP_DECODER.decode(result_text.strip())
             
+            return {
+                "action": game_context['action'],
+                "confidence": result.confidence,
+                "rationale": result.rationale[:RATIONALE_MAX_CHARS]  # Ensure rationale length
+            }
+
+        try:
+            return await self._with_retry(attempt)
         except Exception as e:
-            print(f"Azure decision generation failed (this is normal): {e}")
+            log.warning("Azure decision generation failed (this is normal): %s", e)
             return None
 
     async def generate_bet(self, bankroll: int, hand_number: int) -> Optional[dict]:
         """Generate betting decision using Azure AI Foundry"""
         if not self.enabled:
             return None
-            
-        try:
-            prompt = f"""You are Pat Python deciding how much to bet on blackjack hand #{hand_number}.
-
-BANKROLL: ${bankroll}
-BET LIMITS: ${MIN_BET} minimum, ${MAX_BET} maximum
-
-Pat's personality:
-- Confident and slightly cocky
-- Generally bets 15-25% of bankroll (his "sweet spot")
-- More aggressive when bankroll is healthy (75+)
-- More conservative when low (25 or less)
-- Always has witty reasoning
 
-Generate a betting decision that fits Pat's personality and bankroll situation.
+        key = ("bet", bankroll // 10, hand_number % 10)
+        result = await self._cached(self._bet_cache, key, lambda: self._request_bet(bankroll, hand_number))
+        if result is None:
+            return None
 
-Respond with ONLY this JSON format:
-{{"bet_amount": 20, "rationale": "Your funny explanation for the bet size (max 160 chars)"}}"""
+        # Clamp for this exact bankroll - the cached bet may come from another in the same bucket
+        bet_amount = max(MIN_BET, min(result["bet_amount"], min(MAX_BET, bankroll)))
+        return {**result, "bet_amount": bet_amount}
 
-            response = self.openai_client.chat.completions.create(
-                model=self.deployment_name,
-                messages=[
-                    {"role": "system", "content": "You are Pat Python making betting decisions. Be witty but strategic with bankroll management."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=80,
-                temperature=0.8
+    async def _request_bet(self, bankroll: int, hand_number: int) -> Optional[dict]:
+        async def attempt() -> dict:
+            response = await self.openai_client.chat.completions.create(
+                messages=[*self._bet_messages_template, {"role": "user", "content": BET_USER_TMPL(bankroll, hand_number)}],
+                **self._bet_params
             )
             
-            result_text = response.choices[0].message.content.strip()
-            result = json.loads(result_text)
+            result = BET_RESP_DECODER.decode(response.choices[0].message.content.strip())
+            
+            # Cached unclamped - generate_bet clamps for each caller's bankroll
+            return {
+                "bet_amount": result.bet_amount,
+                "rationale": result.rationale[:160]
+            }
+
+        try:
+            return await self._with_retry(attempt)
+        except Exception as e:
+            log.warning("Azure bet generation failed: %s", e)
+            return None
+
+    async def generate_bet_and_talk(self, bankroll: int, hand_number: int) -> Optional[dict]:
+        """Generate the bet and an opening comment for a new hand in one Azure AI Foundry call"""
+        if not self.enabled:
+            return None
             
-            # Validate and clamp bet amount
-            bet_amount = max(MIN_BET, min(result.get("bet_amount", MIN_BET), min(MAX_BET, bankroll)))
-            result["bet_amount"] = bet_amount
-            result["rationale"] = result.get("rationale", "LLM reasoning failed - going with vibes!")[:160]
+        async def attempt() -> dict:
+            response = await self.openai_client.chat.completions.create(
+                messages=[*self._start_hand_messages_template, {"role": "user", "content": BET_USER_TMPL(bankroll, hand_number)}],
+                **self._start_hand_params
+            )
             
-            return result
+            result = START_HAND_RESP_DECODER.decode(response.choices[0].message.content.strip())
             
+            return {
+                "bet_amount": max(MIN_BET, min(result.bet_amount, min(MAX_BET, bankroll))),
+                "rationale": result.bet_rationale[:160],
+                "say": result.talk[:TALK_MAX_CHARS]
+            }
+
+        try:
+            return await self._with_retry(attempt)
         except Exception as e:
-            print(f"Azure bet generation failed: {e}")
+            log.warning("Azure bet and talk generation failed: %s", e)
             return None
 
+@functools.lru_cache(maxsize=16384)
+def _hand_value(cards: tuple) -> int:
+    value = sum(cards)
+    # Only one Ace (1) can ever count as 11 without busting
+    return value + 10 if 1 in cards and value <= 11 else value
+
 def calculate_hand_value(cards: List[int]) -> int:
     """Calculate the value of a blackjack hand"""
-    value = sum(cards)
-    num_aces = cards.count(1)  # Assuming 1 represents Ace
-    
-    # Handle Aces - make them 11 if it doesn't bust
-    while num_aces > 0 and value + 10 <= 21:
-        value += 10
-        num_aces -= 1
-        
-    return value
+    return _hand_value(tuple(cards))
+
+def _strategy_action(hand_value: int, dealer_upcard: int, is_soft: bool) -> str:
+    # Hit/stand basic strategy, dealer stands on 17 (1 is the dealer's Ace)
+    if is_soft:
+        if hand_value == 18:
+            return "stand" if 2 <= dealer_upcard <= 8 else "hit"
+        return "stand" if hand_value >= 19 else "hit"
+    if hand_value >= 17:
+        return "stand"
+    if hand_value >= 13:
+        return "stand" if 2 <= dealer_upcard <= 6 else "hit"
+    if hand_value == 12:
+        return "stand" if 4 <= dealer_upcard <= 6 else "hit"
+    return "hit"
+
+# (hand value, dealer upcard, soft hand) -> action, precomputed at import
+BASIC_STRATEGY = {
+    (hand_value, dealer_upcard, is_soft): _strategy_action(hand_value, dealer_upcard, is_soft)
+    for hand_value in range(2, 22)
+    for dealer_upcard in range(1, 11)
+    for is_soft in (False, True)
+}
+
+def basic_strategy_action(cards: List[int], dealer_upcard: int) -> str:
+    """Look up the basic-strategy action for a hand"""
+    is_soft = 1 in cards and sum(cards) <= 11  # An Ace is counting as 11
+    return BASIC_STRATEGY.get((calculate_hand_value(cards), dealer_upcard, is_soft), "stand")
+
+def default_talk(my_hand_value: int, dealer_upcard: int) -> str:
+    """Pat's default table talk"""
+    return f"Dealer's got a {dealer_upcard}? My {my_hand_value} is ready!"
+
+def default_bet(bankroll: int) -> dict:
+    """Pat's default personality betting (around 20% of bankroll)"""
+    target_bet = max(MIN_BET, min(int(bankroll * 0.20), min(MAX_BET, bankroll)))
+    return {
+        "bet_amount": target_bet,
+        "rationale": f"${target_bet} it is! My lucky algorithm says go for it!"
+    }
+
+# Azure AI Foundry client - built per worker process by the lifespan below
+azure_client: Optional[AzureAIFoundryClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global azure_client
+    # Headroom over anyio's default 40 threads for any sync code paths
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    azure_client = AzureAIFoundryClient()
+    yield
+    await azure_client.aclose()
 
 # Create FastAPI app
-print("Creating FastAPI application for Pat Python Agent")
-app = FastAPI(title="Pat Python Agent API")
-print("FastAPI application created, setting up agent endpoints")
+log.info("Creating FastAPI application for Pat Python Agent")
+app = FastAPI(title="Pat Python Agent API", lifespan=lifespan)
+log.info("FastAPI application created, setting up agent endpoints")
 
-# Initialize Azure AI Foundry client
-azure_client = AzureAIFoundryClient()
+async def _decode_body(request: Request, decoder: msgspec.json.Decoder) -> Any:
+    try:
+        return decoder.decode(await request.body())
+    except msgspec.DecodeError as e:  # Also covers msgspec.ValidationError
+        raise HTTPException(status_code=422, detail=str(e))
 
-# Agentic API endpoints
+async def parse_agent_io(request: Request) -> AgentIO:
+    """Decode the request body straight into AgentIO, skipping FastAPI's validation"""
+    return await _decode_body(request, AGENT_IO_DECODER)
+
+async def parse_bet_in(request: Request) -> BetIn:
+    """Decode a place_bet/start_hand request body straight into BetIn"""
+    return await _decode_body(request, BET_IN_DECODER)
 
-@app.post("/place_bet", response_model=BetOut)
-async def place_bet(request: dict):
+def json_response(body: Any) -> Response:
+    """Encode a response struct with msgspec, bypassing FastAPI's jsonable_encoder"""
+    return Response(content=msgspec.json.encode(body), media_type="application/json")
+
+# Agent handlers - shared by the per-action endpoints and /batch
+
+async def handle_place_bet(request: BetIn) -> BetOut:
     """Place a bet for the upcoming blackjack hand"""
     try:
-        print(f"DEBUG: place_bet() called with request: {request}")
+        log.debug("place_bet() called with request: %s", request)
         
-        bankroll = request.get("bankroll", 100)
+        bankroll = request.bankroll
         # Handle both handNumber and hand_number for backwards compatibility
-        hand_number = request.get("handNumber", request.get("hand_number", 1))
+        hand_number = request.handNumber if request.handNumber is not None else request.hand_number
         
-        print(f"DEBUG: Parsed - bankroll: {bankroll}, hand_number: {hand_number}")
+        log.debug("Parsed - bankroll: %s, hand_number: %s", bankroll, hand_number)
         
         # Try Azure AI Foundry for betting decision
         azure_response = await azure_client.generate_bet(bankroll, hand_number)
@@ -313,35 +715,62 @@ async def place_bet(request: dict):
         if azure_response and isinstance(azure_response, dict):
             response = azure_response
         else:
-            # Fallback to Pat's default personality betting (around 20% of bankroll)
-            target_bet = max(MIN_BET, min(int(bankroll * 0.20), min(MAX_BET, bankroll)))
-            response = {
-                "bet_amount": target_bet,
-                "rationale": f"${target_bet} it is! My lucky algorithm says go for it!"
-            }
+            response = default_bet(bankroll)
         
-        print(f"DEBUG: Final betting response: {response}")
+        log.debug("Final betting response: %s", response)
         return BetOut(**response)
         
     except Exception as e:
-        print(f"Error in place_bet: {e}")
-        print(f"Error type: {type(e).__name__}")
-        print(f"Error details: {str(e)}")
-        import traceback
-        print(f"Stack trace: {traceback.format_exc()}")
+        if DEBUG_TRACE:
+            log.exception("Error in place_bet")
+        else:
+            log.error("Error in place_bet: %s (%s)", e, type(e).__name__)
         # Pat's betting personality even when everything fails
-        safe_bet = max(MIN_BET, min(request.get("bankroll", 100) // 10, MAX_BET))
+        safe_bet = max(MIN_BET, min(request.bankroll // 10, MAX_BET))
         return BetOut(
             bet_amount=safe_bet,
             rationale="System crashed - betting with pure Python intuition!"
         )
 
-@app.post("/table_talk", response_model=TalkOut)
-async def table_talk(agent_io: AgentIO):
+async def handle_start_hand(request: BetIn) -> StartHandOut:
+    """Place a bet and open the new hand with some table talk in a single LLM round trip"""
+    try:
+        log.debug("start_hand() called with request: %s", request)
+        
+        bankroll = request.bankroll
+        hand_number = request.handNumber if request.handNumber is not None else request.hand_number
+        
+        azure_response = await azure_client.generate_bet_and_talk(bankroll, hand_number)
+        
+        if azure_response and isinstance(azure_response, dict):
+            response = azure_response
+        else:
+            # Fall back to the bet and talk defaults separately
+            response = {
+                **default_bet(bankroll),
+                "say": f"Hand #{hand_number}? Deal me in - this Python is feeling lucky!"
+            }
+        
+        log.debug("Final start_hand response: %s", response)
+        return StartHandOut(**response)
+        
+    except Exception as e:
+        if DEBUG_TRACE:
+            log.exception("Error in start_hand")
+        else:
+            log.error("Error in start_hand: %s (%s)", e, type(e).__name__)
+        safe_bet = max(MIN_BET, min(request.bankroll // 10, MAX_BET))
+        return StartHandOut(
+            bet_amount=safe_bet,
+            rationale="System crashed - betting with pure Python intuition!",
+            say=FALLBACK_SAY
+        )
+
+async def handle_table_talk(agent_io: AgentIO) -> TalkOut:
     """Generate Pat Python's table talk based on current game state"""
     try:
-        print(f"DEBUG: table_talk() called with role: {agent_io.role}")
-        print(f"DEBUG: agent_io data: {agent_io.model_dump()}")
+        log.debug("table_talk() called with role: %s", agent_io.role)
+        log.debug("agent_io data: %r", agent_io)
         
         if agent_io.role != "table-talk":
             raise HTTPException(status_code=400, detail="Expected role 'table-talk'")
@@ -349,7 +778,7 @@ async def table_talk(agent_io: AgentIO):
         my_hand_value = calculate_hand_value(agent_io.me.myHoleCards)
         dealer_upcard = agent_io.public.dealerUpcard
         
-        print(f"DEBUG: My hand value: {my_hand_value}, dealer upcard: {dealer_upcard}")
+        log.debug("My hand value: %s, dealer upcard: %s", my_hand_value, dealer_upcard)
         
         # Try Azure AI Foundry generation first
         game_context = {
@@ -359,29 +788,27 @@ async def table_talk(agent_io: AgentIO):
             "hand_number": agent_io.public.handNumber
         }
         
-        print(f"DEBUG: Calling Azure AI Foundry for table talk with context: {game_context}")
+        log.debug("Calling Azure AI Foundry for table talk with context: %s", game_context)
         azure_response = await azure_client.generate_talk(game_context)
-        print(f"DEBUG: Azure table talk response: {azure_response}")
+        log.debug("Azure table talk response: %s", azure_response)
         
-        comment = azure_response or f"Dealer's got a {dealer_upcard}? My {my_hand_value} is ready!"
-        print(f"DEBUG: Final comment: {comment}")
+        comment = azure_response or default_talk(my_hand_value, dealer_upcard)
+        log.debug("Final comment: %s", comment)
         
         return TalkOut(say=comment[:160])
         
     except Exception as e:
-        print(f"Error in table_talk: {e}")
-        print(f"Error type: {type(e).__name__}")
-        print(f"Error details: {str(e)}")
-        import traceback
-        print(f"Stack trace: {traceback.format_exc()}")
-        return TalkOut(say="Oops, my comedy circuits short-circuited!")
-
-@app.post("/decide", response_model=DecisionOut)
-async def decide(agent_io: AgentIO):
-    """Make Pat Python's blackjack decision based on game state"""
+        if DEBUG_TRACE:
+            log.exception("Error in table_talk")
+        else:
+            log.error("Error in table_talk: %s (%s)", e, type(e).__name__)
+        return FALLBACK_TALK
+
+async def handle_decide(agent_io: AgentIO, with_talk: bool = False) -> DecisionOut:
+    """Make Pat Python's blackjack decision based on game state, plus table talk if with_talk"""
     try:
-        print(f"DEBUG: decide() called with role: {agent_io.role}")
-        print(f"DEBUG: agent_io data: {agent_io.model_dump()}")
+        log.debug("decide() called with role: %s", agent_io.role)
+        log.debug("agent_io data: %r", agent_io)
         
         if agent_io.role != "decision":
             raise HTTPException(status_code=400, detail="Expected role 'decision'")
@@ -390,90 +817,154 @@ async def decide(agent_io: AgentIO):
         my_hand_value = calculate_hand_value(my_cards)
         dealer_upcard = agent_io.public.dealerUpcard
         
-        print(f"DEBUG: My cards: {my_cards}, value: {my_hand_value}, dealer upcard: {dealer_upcard}")
+        # The action is a table lookup; the LLM only supplies Pat's rationale
+        action = basic_strategy_action(my_cards, dealer_upcard)
+        
+        log.debug("My cards: %s, value: %s, dealer upcard: %s, action: %s", my_cards, my_hand_value, dealer_upcard, action)
         
-        # Try Azure AI Foundry generation first
         game_context = {
+            "action": action,
             "my_cards": my_cards,
             "my_hand_value": my_hand_value,
             "dealer_upcard": dealer_upcard,
-            "bankroll": agent_io.me.bankroll
+            "bankroll": agent_io.me.bankroll,
+            "hand_number": agent_io.public.handNumber
         }
         
-        print(f"DEBUG: Calling Azure AI Foundry with context: {game_context}")
-        azure_response = await azure_client.generate_decision(game_context)
-        print(f"DEBUG: Azure response: {azure_response}")
+        log.debug("Calling Azure AI Foundry with context: %s", game_context)
+        if with_talk:
+            # Table talk rides along in the same round trip instead of a second /table_talk call
+            azure_response, talk = await asyncio.gather(
+                azure_client.generate_decision(game_context),
+                azure_client.generate_talk(game_context)
+            )
+            talk = talk or default_talk(my_hand_value, dealer_upcard)
+        else:
+            azure_response, talk = await azure_client.generate_decision(game_context), None
+        log.debug("Azure response: %s, talk: %s", azure_response, talk)
         
-        if azure_response and isinstance(azure_response, dict) and azure_response.get("action") in VALID_ACTIONS:
+        if azure_response and isinstance(azure_response, dict):
             response = azure_response
-            print(f"DEBUG: Using Azure response: {response}")
+            log.debug("Using Azure response: %s", response)
         else:
-            # Simple fallback - Pat's personality-driven default logic
-            if my_hand_value < 17:
-                action = "hit"
-                rationale = "Under 17? Hit me! That's the Pat way!"
-            else:
-                action = "stand"
-                rationale = "I'm staying put - let's see what the dealer's got!"
-            
             response = {
                 "action": action,
-                "confidence": 0.6,
-                "rationale": rationale
+                "confidence": STRATEGY_CONFIDENCE,
+                "rationale": STRATEGY_RATIONALES[action]
             }
-            print(f"DEBUG: Using fallback response: {response}")
+            log.debug("Using fallback response: %s", response)
         
-        return DecisionOut(**response)
+        return DecisionOut(**response, say=talk)
         
     except Exception as e:
-        print(f"Error in decide: {e}")
-        print(f"Error type: {type(e).__name__}")
-        print(f"Error details: {str(e)}")
-        import traceback
-        print(f"Stack trace: {traceback.format_exc()}")
+        if DEBUG_TRACE:
+            log.exception("Error in decide")
+        else:
+            log.error("Error in decide: %s (%s)", e, type(e).__name__)
         # Pat's personality shines through even in errors
-        return DecisionOut(
-            action="stand",
-            confidence=0.4,
-            rationale="My Python circuits are sparking - better play it safe!"
-        )
+        if with_talk:
+            return msgspec.structs.replace(FALLBACK_DECISION, say=FALLBACK_SAY)
+        return FALLBACK_DECISION
+
+# Agentic API endpoints
+
+@app.post("/place_bet")
+async def place_bet(request: BetIn = Depends(parse_bet_in)):
+    """Place a bet for the upcoming blackjack hand"""
+    return json_response(await handle_place_bet(request))
+
+@app.post("/start_hand")
+async def start_hand(request: BetIn = Depends(parse_bet_in)):
+    """Place a bet and open the new hand with some table talk in a single LLM round trip"""
+    return json_response(await handle_start_hand(request))
+
+@app.post("/table_talk")
+async def table_talk(agent_io: AgentIO = Depends(parse_agent_io)):
+    """Generate Pat Python's table talk based on current game state"""
+    return json_response(await handle_table_talk(agent_io))
+
+@app.post("/decide")
+async def decide(agent_io: AgentIO = Depends(parse_agent_io), talk: bool = False):
+    """Make Pat Python's blackjack decision based on game state; ?talk=true adds table talk in 'say'"""
+    return json_response(await handle_decide(agent_io, with_talk=talk))
+
+# Batched calls: name -> (handler, argument type)
+BATCH_HANDLERS = {
+    "place_bet": (handle_place_bet, BetIn),
+    "start_hand": (handle_start_hand, BetIn),
+    "table_talk": (handle_table_talk, AgentIO),
+    "decide": (handle_decide, AgentIO),
+    "decide_and_talk": (functools.partial(handle_decide, with_talk=True), AgentIO)
+}
+
+async def run_batch_call(call: BatchCall) -> Any:
+    if call.name not in BATCH_HANDLERS:
+        raise ValueError(f"Unknown call '{call.name}'")
+    handler, arg_type = BATCH_HANDLERS[call.name]
+    return await handler(msgspec.convert(call.arguments, arg_type))
+
+@app.post("/batch")
+async def batch(request: Request):
+    """Run several agent calls from one request concurrently; results come back in order"""
+    try:
+        calls = BATCH_CALLS_DECODER.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if len(calls) > BATCH_MAX_CALLS:
+        raise HTTPException(status_code=422, detail=f"At most {BATCH_MAX_CALLS} calls per batch")
+    
+    results = await asyncio.gather(*(run_batch_call(call) for call in calls), return_exceptions=True)
+    return json_response([
+        {"error": f"{type(result).__name__}: {result}"} if isinstance(result, Exception) else result
+        for result in results
+    ])
+
+# Static payloads, serialized once at import
+HEALTH_BYTES = msgspec.json.encode({"ok": True, "service": "pat-python", "status": "ready"})
+ROOT_BYTES = msgspec.json.encode({
+    "service": "Pat Python Agent API",
+    "version": "1.0.0",
+    "endpoints": {
+        "place_bet": "/place_bet",
+        "start_hand": "/start_hand",
+        "table_talk": "/table_talk",
+        "decide": "/decide",
+        "batch": "/batch"
+    },
+    "health": "/health"
+})
 
 # Health check endpoint for Aspire
 @app.get("/health")
 async def health():
-    return {"ok": True, "service": "pat-python", "status": "ready"}
+    return Response(content=HEALTH_BYTES, media_type="application/json")
 
 # Root endpoint
 @app.get("/")
 async def root():
-    return {
-        "service": "Pat Python Agent API",
-        "version": "1.0.0",
-        "endpoints": {
-            "place_bet": "/place_bet",
-            "table_talk": "/table_talk", 
-            "decide": "/decide"
-        },
-        "health": "/health"
-    }
+    return Response(content=ROOT_BYTES, media_type="application/json")
 
-print("FastAPI app setup complete - Pure Agent API mode")
+log.info("FastAPI app setup complete - Pure Agent API mode")
 
 FastAPIInstrumentor.instrument_app(app)
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     
-    print("Pat Python Agent API starting up!")
-    print("Ready to deal some cards and crack some jokes!")
-    print("Running in Aspire environment with pure HTTP agent API")
-    print(f"Pat Python Agent API starting on port {port}!")
-    print(f"Agent endpoints available at http://0.0.0.0:{port}/")
+    log.info("Pat Python Agent API starting up!")
+    log.info("Ready to deal some cards and crack some jokes!")
+    log.info("Running in Aspire environment with pure HTTP agent API")
+    log.info("Pat Python Agent API starting on port %s!", port)
+    log.info("Agent endpoints available at http://0.0.0.0:%s/", port)
     
-    # Run with uvicorn
+    # Run with uvicorn - multiple workers need the app as an import string.
+    # Each worker process builds its own Azure client and response caches.
     uvicorn.run(
-        app,
+        "main:app",
         host="0.0.0.0",
         port=port,
+        workers=int(os.getenv("WORKERS", os.cpu_count() or 1)),
+        loop="uvloop" if sys.platform != "win32" else "asyncio",  # uvloop has no Windows build
+        http="httptools",
         log_level="info"
     )
@@ -47,6 +47,7 @@ export const DecisionOut = z.object({
   action: Action,
   confidence: z.number().min(0).max(1),
   rationale: z.string().min(1).max(240),
+  say: z.string().min(1).max(160).optional(),
 });
 
 export type TPublicSnapshot = z.infer<typeof PublicSnapshot>;